@@ -1,14 +1,12 @@
-from typing import Tuple
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional, Tuple
 
 from fastapi import Request, status
 
 from api.services.frauds_service import FraudsService
 from lib.common import logger
-from lib.models import (
-    TransactionAPIRequest,
-    TransactionAPIResponse,
-    TransactionsAPIResponse,
-)
+from lib.common.constant import FRAUDS_CACHE_CONTROL
+from lib.models import TransactionAPIRequest, TransactionAPIResponse
 
 
 class FraudsController:
@@ -23,7 +21,7 @@ class FraudsController:
         self.service = service
         logger.info(
             "FraudsController initialized",
-            extra={"service": getattr(service, "__class__", type(service)).__name__},
+            extra={"service": type(service).__name__},
         )
 
     async def predict(
@@ -44,64 +42,149 @@ class FraudsController:
                 - int: HTTP status code (200).
         """
         # Log incoming request
-        txn_payload = request.transaction.dict()
         logger.info(
             "Incoming predict request",
             extra={
-                "client": http_request.client.host,
-                "path": str(http_request.url),
-                "payload": txn_payload,
+                "client": _client_host(http_request),
+                "path": http_request.url.path,
             },
         )
 
         # Delegate to service
-        response = self.service.predict(request)
+        response = await self.service.predict(request)
 
         # Log outgoing response
         logger.info(
             "Predict response",
             extra={
-                "client": http_request.client.host,
+                "client": _client_host(http_request),
                 "status": status.HTTP_200_OK,
-                "response": response.dict(),
+                "predicted_fraud": response.predicted_fraud,
             },
         )
         return response, status.HTTP_200_OK
 
     async def get_frauds(
-        self, http_request: Request
-    ) -> Tuple[TransactionsAPIResponse, int]:
+        self,
+        http_request: Request,
+        limit: int = 100,
+        offset: int = 0,
+        since: Optional[datetime] = None,
+    ) -> Tuple[Optional[bytes], int, Dict[str, str]]:
         """
         Handle GET /frauds.
 
+        Responses carry a weak ETag derived from the predictions table version.
+        A request whose `If-None-Match` still matches gets 304 without the
+        page being queried or encoded.
+
         Args:
-            http_request (Request): FastAPI request object, for logging client info.
+            http_request (Request): FastAPI request object, for logging client info
+                and reading `If-None-Match`.
+            limit (int): Maximum number of predictions to return.
+            offset (int): Number of newest predictions to skip.
+            since (Optional[datetime]): Only include predictions made at or after this time.
 
         Returns:
-            Tuple[TransactionsAPIResponse, int]:
-                - TransactionsAPIResponse: Mapping of record IDs to prediction responses.
-                - int: HTTP status code (200).
+            Tuple[Optional[bytes], int, Dict[str, str]]:
+                - Optional[bytes]: JSON-encoded TransactionsAPIResponse mapping record IDs
+                  to prediction responses, or None when not modified.
+                - int: HTTP status code (200 or 304).
+                - Dict[str, str]: Caching headers (ETag, Cache-Control) to send back.
         """
         # Log invocation
         logger.info(
             "Incoming get_frauds request",
             extra={
-                "client": http_request.client.host,
-                "path": str(http_request.url),
+                "client": _client_host(http_request),
+                "path": http_request.url.path,
             },
         )
 
+        # Revalidate against the predictions table version
+        version = await self.service.get_frauds_version()
+        since_tag = since.isoformat() if since else ""
+        etag = f'W/"{version}-{limit}-{offset}-{since_tag}"'
+        headers = {"ETag": etag, "Cache-Control": FRAUDS_CACHE_CONTROL}
+        if _etag_matches(http_request.headers.get("if-none-match"), etag):
+            logger.info(
+                "get_frauds not modified",
+                extra={
+                    "client": _client_host(http_request),
+                    "status": status.HTTP_304_NOT_MODIFIED,
+                },
+            )
+            return None, status.HTTP_304_NOT_MODIFIED, headers
+
         # Delegate to service
-        response = self.service.get_frauds()
+        body, count = await self.service.get_frauds(
+            etag, limit=limit, offset=offset, since=since
+        )
 
         # Log result count
-        count = len(response.transactions)
         logger.info(
-            "Return all previously transactions predicted",
+            "Return previously predicted transactions",
             extra={
-                "client": http_request.client.host,
+                "client": _client_host(http_request),
                 "status": status.HTTP_200_OK,
                 "fraud_count": count,
             },
         )
-        return response, status.HTTP_200_OK
+        return body, status.HTTP_200_OK, headers
+
+    async def export_frauds(
+        self, http_request: Request, since: Optional[datetime] = None
+    ) -> Tuple[AsyncIterator[bytes], int]:
+        """
+        Handle GET /frauds/export.
+
+        Args:
+            http_request (Request): FastAPI request object, for logging client info.
+            since (Optional[datetime]): Only include predictions made at or after this time.
+
+        Returns:
+            Tuple[AsyncIterator[bytes], int]:
+                - AsyncIterator[bytes]: Newline-delimited JSON, one chunk of predictions per item.
+                - int: HTTP status code (200).
+        """
+        logger.info(
+            "Incoming export_frauds request",
+            extra={
+                "client": _client_host(http_request),
+                "path": http_request.url.path,
+            },
+        )
+        return self.service.stream_frauds(since=since), status.HTTP_200_OK
+
+
+def _client_host(http_request: Request) -> str:
+    """
+    Return the client address for log lines.
+
+    Args:
+        http_request (Request): The incoming request.
+
+    Returns:
+        str: The client host, or "-" when the server did not report one.
+    """
+    return http_request.client.host if http_request.client else "-"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an `If-None-Match` header value against the current ETag.
+
+    Uses the weak comparison required for `If-None-Match` (RFC 9110
+    section 13.1.2), so `W/"x"` and `"x"` match each other.
+
+    Args:
+        if_none_match (Optional[str]): Raw header value, possibly a comma-separated list.
+        etag (str): The current entity tag.
+
+    Returns:
+        bool: True if the client's cached copy is still current.
+    """
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
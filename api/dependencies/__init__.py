@@ -1 +1 @@
-from .dependencies import get_frauds_controller
+from .dependencies import get_frauds_controller, set_frauds_controller
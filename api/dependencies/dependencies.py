@@ -1,16 +1,35 @@
-from fastapi import Request
+from typing import Optional
 
 from api.controllers import FraudsController
 
+_frauds_controller: Optional[FraudsController] = None
 
-def get_frauds_controller(request: Request) -> FraudsController:
+
+def set_frauds_controller(controller: Optional[FraudsController]) -> None:
     """
-    Dependency injector for the FraudsController.
+    Register the FraudsController singleton served by `get_frauds_controller`.
+
+    Called once from the application lifespan.
 
     Args:
-        request (Request): The FastAPI request object, used to access application state.
+        controller (Optional[FraudsController]): The controller instance, or None to clear it.
+    """
+    global _frauds_controller
+    _frauds_controller = controller
+
+
+async def get_frauds_controller() -> FraudsController:
+    """
+    Dependency injector for the FraudsController.
+
+    Returns the module-level singleton directly, so no per-request lookup
+    through `request.app.state` is needed. It is a coroutine because it
+    does no blocking work; FastAPI would otherwise run a sync dependency
+    in the threadpool on every request.
 
     Returns:
-        FraudsController: The controller instance stored on `app.state`.
+        FraudsController: The controller instance registered at startup.
     """
-    return request.app.state.fraud_controller
+    if _frauds_controller is None:
+        raise RuntimeError("FraudsController has not been initialized")
+    return _frauds_controller
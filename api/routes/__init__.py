@@ -1,2 +1,3 @@
 from .frauds_route import router as frauds_router
+from .swagger_route import build_openapi_schema
 from .swagger_route import router as swagger_router
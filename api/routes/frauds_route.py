@@ -1,4 +1,9 @@
-from fastapi import APIRouter, Depends, Request, Response, status
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
 from api.controllers import FraudsController
 from api.dependencies import get_frauds_controller
@@ -11,6 +16,48 @@ from lib.models import (
 router = APIRouter(tags=["MODEL_SERVING"])
 
 
+class _ClosingStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that always closes its body iterator.
+
+    Starlette abandons the iterator when the client disconnects mid-stream,
+    leaving it (and whatever cursor it holds) to the garbage collector.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+
+
+def _json_response(
+    model: BaseModel, status_code: int, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serialize an already-built response model straight to JSON.
+
+    Returning a Response bypasses FastAPI's `response_model` handling, which
+    would otherwise dump the model, validate it again and re-encode it. The
+    models are built by the service layer, so that round trip is redundant;
+    `response_model` is still declared on the routes for the OpenAPI schema.
+
+    Args:
+        model (BaseModel): The response model to send.
+        status_code (int): HTTP status code.
+        headers (Optional[Dict[str, str]]): Extra response headers.
+
+    Returns:
+        Response: JSON response encoded by pydantic-core.
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
 @router.post(
     "/predict",
     status_code=status.HTTP_200_OK,
@@ -21,7 +68,7 @@ Accepts a single transaction payload and returns a model-predicted fraud flag.
 Workflow:
 1. Validates that the request body matches the TransactionAPIRequest schema.
 2. Controller invokes the ML model to predict fraud.
-3. Prediction is persisted in the database.
+3. Prediction is queued and persisted to the database in the background.
 4. Returns the original transaction plus the `predicted_fraud` flag.
 """,
     response_description="A JSON object containing the original transaction and the fraud prediction flag.",
@@ -87,25 +134,27 @@ Workflow:
 async def predict_fraudulent_transaction(
     http_request: Request,
     request: TransactionAPIRequest,
-    response: Response,
     controller: FraudsController = Depends(get_frauds_controller),
 ):
     result, status_code = await controller.predict(request, http_request)
-    response.status_code = status_code
-    return result
+    return _json_response(result, status_code)
 
 
 @router.get(
     "/frauds",
     status_code=status.HTTP_200_OK,
-    summary="List all predicted frauds",
+    summary="List predicted frauds",
     description="""
-Retrieves all past fraud predictions, ordered newest first.
+Retrieves one page of past fraud predictions, ordered newest first.
 
 Workflow:
-1. Controller fetches all persisted TransactionRecord entries.
+1. Controller fetches up to `limit` persisted TransactionRecord entries, skipping the newest `offset`
+   (optionally only those predicted at or after `since`).
 2. Maps each record to TransactionAPIResponse.
 3. Returns a mapping of record IDs to their prediction responses.
+
+Responses carry an `ETag`; send it back in `If-None-Match` to get `304 Not Modified`
+while no new prediction has been saved. Use `/frauds/export` to download every prediction.
 """,
     response_description="A JSON object mapping record IDs to their transaction data and fraud flags.",
     responses={
@@ -148,6 +197,9 @@ Workflow:
                 }
             },
         },
+        304: {
+            "description": "Not modified — no new predictions since the given ETag",
+        },
         500: {
             "description": "Internal server error — unable to retrieve records",
             "content": {
@@ -161,9 +213,61 @@ Workflow:
 )
 async def get_fraudulent_transactions(
     http_request: Request,
-    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
+    offset: int = Query(0, ge=0, description="Number of newest records to skip"),
+    since: Optional[datetime] = Query(
+        None, description="Only include predictions made at or after this time"
+    ),
+    controller: FraudsController = Depends(get_frauds_controller),
+):
+    body, status_code, headers = await controller.get_frauds(
+        http_request, limit=limit, offset=offset, since=since
+    )
+    if status_code == status.HTTP_304_NOT_MODIFIED:
+        return Response(status_code=status_code, headers=headers)
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+@router.get(
+    "/frauds/export",
+    status_code=status.HTTP_200_OK,
+    summary="Export all predicted frauds",
+    description="""
+Streams every past fraud prediction as newline-delimited JSON, ordered newest first.
+
+Workflow:
+1. Controller reads persisted TransactionRecord entries from the database in chunks
+   (optionally only those predicted at or after `since`).
+2. Records are written as JSON lines one database chunk at a time, so the full table is never held in memory.
+""",
+    response_description="Newline-delimited JSON, one prediction per line.",
+    responses={
+        200: {
+            "description": "Export started",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"id":102,"transaction":{"time_ind":11,"transac_type":"CASH_OUT",'
+                    '"amount":5000.0,"src_acc":"acc003","src_bal":8000.0,"src_new_bal":3000.0,'
+                    '"dst_acc":"acc004","dst_bal":100.0,"dst_new_bal":5100.0},"predicted_fraud":true}\n'
+                }
+            },
+        },
+    },
+    response_class=StreamingResponse,
+)
+async def export_fraudulent_transactions(
+    http_request: Request,
+    since: Optional[datetime] = Query(
+        None, description="Only include predictions made at or after this time"
+    ),
     controller: FraudsController = Depends(get_frauds_controller),
 ):
-    result, status_code = await controller.get_frauds(http_request)
-    response.status_code = status_code
-    return result
+    lines, status_code = await controller.export_frauds(http_request, since=since)
+    return _ClosingStreamingResponse(
+        lines, status_code=status_code, media_type="application/x-ndjson"
+    )
@@ -1,11 +1,41 @@
-from fastapi import APIRouter, Request
+import orjson
+from fastapi import APIRouter, FastAPI, Request, Response
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse
 
 router = APIRouter(tags=["Documentation"])
 
 
+def build_openapi_schema(app: FastAPI) -> bytes:
+    """
+    Generate the application’s OpenAPI schema and cache it on `app.state`.
+
+    The spec only depends on the registered routes, so it is built once
+    (eagerly from `lifespan`) and served as pre-encoded JSON bytes.
+
+    Parameters:
+    -----------
+    app: FastAPI
+        The application whose metadata and routes describe the schema.
+
+    Returns:
+    --------
+    bytes
+        The JSON-encoded OpenAPI spec.
+    """
+    spec = get_openapi(
+        title=app.title,
+        version=app.version,
+        description=app.description,
+        routes=app.routes,
+        contact=app.contact,
+        license_info=app.license_info,
+    )
+    app.state.openapi_bytes = orjson.dumps(spec)
+    return app.state.openapi_bytes
+
+
 @router.get(
     "/",
     include_in_schema=False,
@@ -36,6 +66,7 @@ async def swagger_ui_html(request: Request) -> HTMLResponse:
         openapi_url=request.url_for("openapi_schema"),
         title=f"{request.app.title} – Swagger UI",
         swagger_favicon_url="/favicon.ico",
+        swagger_ui_parameters=request.app.swagger_ui_parameters,
     )
 
 
@@ -68,14 +99,14 @@ async def redoc_ui_html(request: Request) -> HTMLResponse:
     include_in_schema=False,
     name="openapi_schema",
     summary="OpenAPI JSON schema",
-    description="Dynamically generate and return the OpenAPI spec in JSON format.",
+    description="Return the cached OpenAPI spec in JSON format.",
 )
-async def openapi_schema(request: Request) -> JSONResponse:
+async def openapi_schema(request: Request) -> Response:
     """
-    Build and return the application’s OpenAPI schema.
+    Return the application’s OpenAPI schema.
 
-    Reads metadata directly from `app.title`, `app.version`,
-    `app.description`, and the registered routes.
+    Serves the bytes cached by `build_openapi_schema`, building them on
+    first use if the cache has not been populated yet.
 
     Parameters:
     -----------
@@ -83,10 +114,7 @@ async def openapi_schema(request: Request) -> JSONResponse:
         The incoming request, whose `app` attribute holds metadata
         and routes to generate the schema.
     """
-    spec = get_openapi(
-        title=request.app.title,
-        version=request.app.version,
-        description=request.app.description,
-        routes=request.app.routes,
-    )
-    return JSONResponse(content=spec)
+    body = getattr(request.app.state, "openapi_bytes", None)
+    if body is None:
+        body = build_openapi_schema(request.app)
+    return Response(content=body, media_type="application/json")
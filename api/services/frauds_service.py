@@ -1,8 +1,26 @@
-from typing import Dict, List
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
+import orjson
 import pandas as pd
+from cachetools import TTLCache
+from fastapi.concurrency import iterate_in_threadpool
 
 from lib.common import logger
+from lib.common.constant import (
+    FRAUDS_CACHE_MAXSIZE,
+    FRAUDS_CACHE_TTL,
+    PREDICT_QUEUE_MAXSIZE,
+    WRITE_BATCH_SIZE,
+    WRITE_QUEUE_MAXSIZE,
+    WRITE_RETRY_ATTEMPTS,
+    WRITE_RETRY_BACKOFF,
+)
 from lib.models import (
     Transaction,
     TransactionAPIRequest,
@@ -12,6 +30,9 @@ from lib.models import (
 )
 from lib.repositories import FraudRepository
 
+TRANSACTION_FIELDS = tuple(Transaction.model_fields)
+RECORD_COLUMNS = ("id", *TRANSACTION_FIELDS, "is_fraud")
+
 
 class FraudsService:
     """
@@ -25,9 +46,20 @@ class FraudsService:
         repository (FraudRepository): Repository for database operations.
         model: AI/ML model instance implementing .predict() interface.
         feature_cols (List[str]): Ordered list of feature column names for prediction.
+        max_batch_size (int): Maximum number of transactions scored per model call.
+        batch_timeout_ms (float): How long to wait for a batch to fill, in milliseconds.
+        executor (Optional[Executor]): Pool running blocking inference and DB calls.
     """
 
-    def __init__(self, repository: FraudRepository, model, feature_cols: List[str]):
+    def __init__(
+        self,
+        repository: FraudRepository,
+        model,
+        feature_cols: List[str],
+        max_batch_size: int = 32,
+        batch_timeout_ms: float = 2.0,
+        executor: Optional[Executor] = None,
+    ):
         """
         Initialize the FraudsService with dependencies.
 
@@ -35,22 +67,59 @@ class FraudsService:
             repository (FraudRepository): Repository for DB interactions.
             model: Trained ML model with a .predict() method.
             feature_cols (List[str]): Feature column names used for model input.
+            max_batch_size (int): Maximum number of transactions scored per model call.
+            batch_timeout_ms (float): How long to wait for a batch to fill, in milliseconds.
+            executor (Optional[Executor]): Pool running blocking inference and DB calls.
+                Defaults to the event loop's default executor.
         """
         self.repo = repository
         self.model = model
+        self._model_cls_name = type(model).__name__
         self.feature_cols = feature_cols
+        self._fill_row = self._compile_row_filler(feature_cols)
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout_ms / 1000
+        self._batch = np.empty((max_batch_size, len(feature_cols)), dtype=object)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=PREDICT_QUEUE_MAXSIZE)
+        self._write_queue: asyncio.Queue = asyncio.Queue(maxsize=WRITE_QUEUE_MAXSIZE)
+        self.dropped_records = 0
+        self._frauds_cache: TTLCache = TTLCache(
+            maxsize=FRAUDS_CACHE_MAXSIZE, ttl=FRAUDS_CACHE_TTL
+        )
+        self._frauds_version: Optional[int] = None
+        self._frauds_version_expires = 0.0
         logger.info(
             "FraudsService initialized",
             extra={
-                "repository": str(repository),
-                "model": getattr(model, "__class__", type(model)).__name__,
+                "repository": type(repository).__name__,
+                "model": self._model_cls_name,
                 "feature_cols": feature_cols,
             },
         )
 
-    def predict(self, request: TransactionAPIRequest) -> TransactionAPIResponse:
+    def warmup(self) -> None:
+        """
+        Run one throwaway prediction so lazy initialisation happens before traffic.
+
+        Scores a placeholder transaction (zeros and empty strings) through
+        the batch path without persisting anything.
         """
-        Run a fraud prediction on a single transaction and persist the result.
+        placeholder = Transaction.model_construct(
+            **{
+                name: field.annotation()
+                for name, field in Transaction.model_fields.items()
+            }
+        )
+        self._score_batch([placeholder])
+
+    async def predict(self, request: TransactionAPIRequest) -> TransactionAPIResponse:
+        """
+        Queue a transaction for batched prediction.
+
+        The transaction is scored together with any other requests that arrive
+        within the batch window (see `run_batch_worker`). Persistence happens
+        afterwards in the background, so the response does not wait on the DB.
 
         Args:
             request (TransactionAPIRequest): Pydantic request containing transaction data.
@@ -59,89 +128,416 @@ class FraudsService:
             TransactionAPIResponse: Pydantic response with original transaction and fraud flag.
         """
         txn: Transaction = request.transaction
-        logger.info(
-            "Predict called",
-            extra={
-                "transaction_id": txn.dict().get("time_ind"),
-                "input_payload": txn.dict(),
-            },
-        )
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((txn, future))
+        predicted = await future
+        return self._build_response(txn, predicted)
 
-        # 1) Prepare DataFrame
-        df = pd.DataFrame([txn.dict()], columns=self.feature_cols)
-        logger.debug(
-            "Constructed DataFrame for prediction",
-            extra={"df_head": df.head(1).to_dict(orient="records")},
-        )
+    async def run_batch_worker(self) -> None:
+        """
+        Drain the prediction queue and score pending transactions in batches.
 
-        # 2) Execute model
-        prediction_array = self.model.predict(df)
-        predicted = bool(prediction_array[0])
-        logger.info(
-            "Model prediction complete",
-            extra={
-                "prediction_array": (
-                    prediction_array.tolist()
-                    if hasattr(prediction_array, "tolist")
-                    else list(prediction_array)
-                ),
-                "predicted_label": predicted,
-            },
-        )
+        Blocks until one transaction is queued, then keeps collecting until
+        either `max_batch_size` items are pending or the batch timeout has
+        elapsed. The batch is scored on the executor, each waiter receives its
+        own label, and the resulting records are handed to the write-behind
+        queue (see `run_write_worker`).
 
-        # 3) Persist prediction
-        db_rec = TransactionRecord(**txn.dict(), is_fraud=predicted)
-        self.repo.add(db_rec)
-        logger.info(
-            "Prediction saved to database",
-            extra={"record_id": getattr(db_rec, "id", None), "is_fraud": predicted},
-        )
+        Intended to run as a background task for the lifetime of the app.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            deadline = loop.time() + self.batch_timeout
+            while len(pending) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            txns = [txn for txn, _ in pending]
+            try:
+                labels = await loop.run_in_executor(
+                    self.executor, self._score_batch, txns
+                )
+            except Exception as exc:
+                logger.exception("Batch prediction failed")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            for (_, future), label in zip(pending, labels):
+                if not future.done():
+                    future.set_result(label)
+
+            await self._enqueue_writes(
+                [
+                    TransactionRecord(**txn.__dict__, is_fraud=label)
+                    for txn, label in zip(txns, labels)
+                ]
+            )
+
+    async def run_write_worker(self) -> None:
+        """
+        Persist queued prediction records in batches.
+
+        Waits for at least one record, then takes whatever else is already
+        queued (up to `WRITE_BATCH_SIZE`) and inserts it in one commit on the
+        executor. Records keep accumulating while a write is in flight, so
+        batches grow with load. Failed writes are retried with backoff and
+        only dropped (and counted in `dropped_records`) once retries run out.
+
+        Runs as a background task until `close_write_queue` is called, and
+        returns once every record queued before that has been written.
+        """
+        closed = False
+        while not closed:
+            records = [await self._write_queue.get()]
+            records.extend(self._drain_writes(WRITE_BATCH_SIZE - 1))
+            # The close marker is always the last item ever queued.
+            if records[-1] is None:
+                records.pop()
+                closed = True
+            if records:
+                await self._persist(records)
+
+    async def close_write_queue(self) -> None:
+        """
+        Signal the write worker to flush the remaining records and exit.
+
+        Must be called after the batch worker has stopped, so nothing else
+        is queued behind the close marker.
+        """
+        await self._write_queue.put(None)
+
+    async def _enqueue_writes(self, records: List[TransactionRecord]) -> None:
+        """
+        Hand scored records to the write-behind queue.
+
+        When the queue is full, the overflow is written inline instead so the
+        batch worker slows down to the pace of the database.
+
+        Args:
+            records (List[TransactionRecord]): Records to persist.
+        """
+        for idx, record in enumerate(records):
+            try:
+                self._write_queue.put_nowait(record)
+            except asyncio.QueueFull:
+                overflow = records[idx:]
+                logger.warning(
+                    "Write queue full, persisting inline",
+                    extra={"count": len(overflow)},
+                )
+                await self._persist(overflow)
+                return
+
+    async def _persist(self, records: List[TransactionRecord]) -> None:
+        """
+        Insert records in one commit, retrying with exponential backoff.
+
+        Tries up to `WRITE_RETRY_ATTEMPTS` times so a short database outage
+        does not lose audit rows. If every attempt fails the records are
+        dropped and added to `dropped_records`.
+
+        Args:
+            records (List[TransactionRecord]): Records to persist.
+        """
+        loop = asyncio.get_running_loop()
+        delay = WRITE_RETRY_BACKOFF
+        for attempt in range(1, WRITE_RETRY_ATTEMPTS + 1):
+            try:
+                await loop.run_in_executor(self.executor, self.repo.add_many, records)
+                self._frauds_version = None
+                return
+            except Exception:
+                if attempt == WRITE_RETRY_ATTEMPTS:
+                    self.dropped_records += len(records)
+                    logger.exception(
+                        "Dropped predictions after repeated write failures",
+                        extra={
+                            "count": len(records),
+                            "dropped_records": self.dropped_records,
+                        },
+                    )
+                    return
+                logger.warning(
+                    "Failed to persist predictions, retrying",
+                    exc_info=True,
+                    extra={"count": len(records), "attempt": attempt, "delay": delay},
+                )
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    def _drain_writes(self, limit: int) -> List[TransactionRecord]:
+        """
+        Take up to `limit` records from the write queue without waiting.
+
+        Args:
+            limit (int): Maximum number of records to take.
+
+        Returns:
+            List[TransactionRecord]: The records removed from the queue.
+        """
+        records: List[TransactionRecord] = []
+        while len(records) < limit:
+            try:
+                records.append(self._write_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return records
+
+    def _score_batch(self, txns: List[Transaction]) -> List[bool]:
+        """
+        Score a batch of transactions with one model call.
+
+        Only ever called by `run_batch_worker`, one batch at a time, so the
+        shared batch buffer is never written concurrently.
+
+        Args:
+            txns (List[Transaction]): Transactions to score, at most `max_batch_size`.
+
+        Returns:
+            List[bool]: Fraud label for each transaction, in input order.
+        """
+        batch = self._batch[: len(txns)]
+        for idx, txn in enumerate(txns):
+            self._fill_row(txn, batch, idx)
+        df = pd.DataFrame(batch, columns=self.feature_cols, copy=False)
+        labels = [bool(label) for label in self.model.predict(df)]
+        logger.debug("Batch scored", extra={"batch_size": len(labels)})
+        return labels
+
+    def _build_response(
+        self, txn: Transaction, predicted: bool
+    ) -> TransactionAPIResponse:
+        """
+        Build the API response for a scored transaction.
 
-        # 4) Build response
+        Args:
+            txn (Transaction): The transaction that was scored.
+            predicted (bool): Fraud label returned by the model.
+
+        Returns:
+            TransactionAPIResponse: Pydantic response with original transaction and fraud flag.
+        """
         response = TransactionAPIResponse(
             transaction=txn,
             predicted_fraud=predicted,
         )
-        logger.info(
-            "Returning prediction response",
-            extra={"response_payload": response.dict()},
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Returning prediction response",
+                extra={"response_payload": response.dict()},
+            )
         return response
 
-    def get_frauds(self) -> TransactionsAPIResponse:
+    @staticmethod
+    def _compile_row_filler(
+        feature_cols: List[str],
+    ) -> Callable[[Transaction, np.ndarray, int], None]:
         """
-        Retrieve all persisted fraud predictions, newest first.
+        Generate a row-filling function specialised for `feature_cols`.
+
+        The feature order is fixed at startup, so rather than looping over
+        the columns on every call, the column lookups are unrolled into a
+        single tuple assignment, e.g. for ["amount", "src_bal"]:
+
+            def fill_row(txn, out, idx):
+                values = txn.__dict__
+                out[idx] = (values['amount'], values['src_bal'])
+
+        Args:
+            feature_cols (List[str]): Ordered feature column names.
+
+        Returns:
+            Callable[[Transaction, np.ndarray, int], None]: Function copying a
+            transaction's feature values into row `idx` of `out`.
+        """
+        lookups = ", ".join(f"values[{col!r}]" for col in feature_cols)
+        src = (
+            "def fill_row(txn, out, idx):\n"
+            "    values = txn.__dict__\n"
+            f"    out[idx] = ({lookups},)\n"
+        )
+        namespace: Dict[str, Callable] = {}
+        exec(compile(src, "<fill_row>", "exec"), namespace)
+        return namespace["fill_row"]
+
+    async def get_frauds_version(self) -> int:
+        """
+        Return a marker that changes whenever a new prediction is persisted.
+
+        The repository version is read at most once per `FRAUDS_CACHE_TTL`
+        seconds and is dropped as soon as this process commits a write, so
+        revalidating requests usually cost no database work. Writes committed
+        by other worker processes show up within that TTL, the same window
+        clients are already allowed to reuse a page for (`Cache-Control`).
+
+        Returns:
+            int: The repository's table version, bumped by every committed write.
+        """
+        now = time.monotonic()
+        if self._frauds_version is None or now >= self._frauds_version_expires:
+            loop = asyncio.get_running_loop()
+            self._frauds_version = await loop.run_in_executor(
+                self.executor, self.repo.version
+            )
+            self._frauds_version_expires = now + FRAUDS_CACHE_TTL
+        return self._frauds_version
+
+    async def get_frauds(
+        self,
+        etag: str,
+        limit: int = 100,
+        offset: int = 0,
+        since: Optional[datetime] = None,
+    ) -> Tuple[bytes, int]:
+        """
+        Retrieve a page of persisted fraud predictions as encoded JSON.
+
+        Pages are served from a short-lived in-memory cache holding the
+        encoded body alongside the ETag it was built for, so repeated polls
+        skip both the query and serialization while the ETag still matches.
+        Misses are queried and encoded on the executor.
+
+        Args:
+            etag (str): ETag of the current page version (see `get_frauds_version`).
+            limit (int): Maximum number of predictions to return.
+            offset (int): Number of newest predictions to skip.
+            since (Optional[datetime]): Only include predictions made at or after this time.
+
+        Returns:
+            Tuple[bytes, int]:
+                - bytes: The JSON-encoded TransactionsAPIResponse.
+                - int: Number of predictions in the page.
+        """
+        # Only touched from the event loop, so the cache needs no lock.
+        key = (limit, offset, since)
+        cached = self._frauds_cache.get(key)
+        if cached is not None and cached[0] == etag:
+            return cached[1], cached[2]
+
+        loop = asyncio.get_running_loop()
+        body, count = await loop.run_in_executor(
+            self.executor, self._encode_frauds_page, limit, offset, since
+        )
+        self._frauds_cache[key] = (etag, body, count)
+        return body, count
+
+    def _encode_frauds_page(
+        self, limit: int, offset: int, since: Optional[datetime]
+    ) -> Tuple[bytes, int]:
+        """
+        Build a page with `get_frauds_sync` and encode it to JSON.
+
+        Args:
+            limit (int): Maximum number of predictions to return.
+            offset (int): Number of newest predictions to skip.
+            since (Optional[datetime]): Only include predictions made at or after this time.
+
+        Returns:
+            Tuple[bytes, int]: The encoded page and its number of predictions.
+        """
+        response = self.get_frauds_sync(limit, offset, since)
+        return response.model_dump_json().encode(), len(response.transactions)
+
+    def get_frauds_sync(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        since: Optional[datetime] = None,
+    ) -> TransactionsAPIResponse:
+        """
+        Retrieve a page of persisted fraud predictions, newest first.
+
+        Args:
+            limit (int): Maximum number of predictions to return.
+            offset (int): Number of newest predictions to skip.
+            since (Optional[datetime]): Only include predictions made at or after this time.
 
         Returns:
             TransactionsAPIResponse: Pydantic wrapper containing a dict of ID to responses.
         """
-        logger.info("Fetching all fraud records")
-        db_rows = self.repo.list_all()
+        logger.info(
+            "Fetching fraud records",
+            extra={"limit": limit, "offset": offset, "since": since},
+        )
+        rows = self.repo.list_rows(
+            RECORD_COLUMNS, limit=limit, offset=offset, since=since
+        )
         logger.info(
             "Fetched records",
-            extra={"count": len(db_rows)},
+            extra={"count": len(rows)},
         )
 
-        result: Dict[int, TransactionAPIResponse] = {}
-        for rec in db_rows:
-            txn = Transaction.from_orm(rec)
-            response_obj = TransactionAPIResponse(
-                transaction=txn,
-                predicted_fraud=rec.is_fraud,
-            )
-            result[rec.id] = response_obj
-            logger.debug(
-                "Mapped DB record to response",
-                extra={
-                    "record_id": rec.id,
-                    "transaction": txn.dict(),
-                    "predicted_fraud": rec.is_fraud,
-                },
+        # Rows come straight from the DB, so skip pydantic validation.
+        result: Dict[int, TransactionAPIResponse] = {
+            record_id: TransactionAPIResponse.model_construct(
+                transaction=Transaction.model_construct(
+                    **dict(zip(TRANSACTION_FIELDS, txn_values))
+                ),
+                predicted_fraud=is_fraud,
             )
+            for record_id, *txn_values, is_fraud in rows
+        }
 
-        final_response = TransactionsAPIResponse(transactions=result)
+        final_response = TransactionsAPIResponse.model_construct(transactions=result)
         logger.info(
-            "Returning all fraud transactions response",
-            extra={"response_count": len(final_response.transactions)},
+            "Returning fraud transactions response",
+            extra={"response_count": len(result)},
         )
         return final_response
+
+    async def stream_frauds(
+        self, since: Optional[datetime] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream every persisted fraud prediction as newline-delimited JSON, newest first.
+
+        Each line is a JSON object with the record `id`, its `transaction`
+        and the `predicted_fraud` flag. Rows are read from the database in
+        chunks and each chunk is encoded off the event loop and sent as one
+        body part, so memory use does not grow with the table. The database
+        cursor is released as soon as the stream ends or the client goes away.
+
+        Args:
+            since (Optional[datetime]): Only include predictions made at or after this time.
+
+        Yields:
+            bytes: The encoded JSON lines for one chunk of predictions.
+        """
+        logger.info("Streaming fraud records", extra={"since": since})
+        chunks = self._encode_fraud_chunks(since)
+        try:
+            async for chunk in iterate_in_threadpool(chunks):
+                yield chunk
+        finally:
+            chunks.close()
+
+    def _encode_fraud_chunks(self, since: Optional[datetime]) -> Iterator[bytes]:
+        """
+        Read fraud records chunk by chunk and encode each chunk as NDJSON.
+
+        Args:
+            since (Optional[datetime]): Only include predictions made at or after this time.
+
+        Yields:
+            bytes: One or more newline-terminated JSON lines.
+        """
+        for rows in self.repo.iter_row_chunks(RECORD_COLUMNS, since=since):
+            yield b"".join(
+                orjson.dumps(
+                    {
+                        "id": row[0],
+                        "transaction": dict(zip(TRANSACTION_FIELDS, row[1:-1])),
+                        "predicted_fraud": row[-1],
+                    }
+                )
+                + b"\n"
+                for row in rows
+            )
@@ -0,0 +1,28 @@
+# Upper bound on transactions waiting to be batched for prediction
+PREDICT_QUEUE_MAXSIZE = 1024
+
+# Database connections shared by all server processes (pool size, and the
+# overflow allowed on top of it under load)
+DB_POOL_SIZE = 20
+DB_MAX_OVERFLOW = 40
+
+# Upper bound on prediction records waiting to be written to the database
+WRITE_QUEUE_MAXSIZE = 10000
+
+# Maximum number of prediction records inserted per commit
+WRITE_BATCH_SIZE = 500
+
+# Attempts per prediction write batch, and the first retry delay in seconds
+# (doubled after each failure) before the batch is dropped
+WRITE_RETRY_ATTEMPTS = 4
+WRITE_RETRY_BACKOFF = 0.5
+
+# Fraction of requests without an X-Request-ID whose start/end lines are logged
+REQUEST_LOG_SAMPLE_RATE = 0.1
+
+# Number of /frauds pages kept in memory, and for how many seconds
+FRAUDS_CACHE_MAXSIZE = 64
+FRAUDS_CACHE_TTL = 5
+
+# Cache-Control header sent with /frauds pages
+FRAUDS_CACHE_CONTROL = f"private, max-age={FRAUDS_CACHE_TTL}"
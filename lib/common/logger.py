@@ -1,12 +1,73 @@
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+LOG_QUEUE_MAXSIZE = 10000
+
+# Attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Render each record as a single orjson-encoded JSON line.
+
+    Fields passed via `extra=` are emitted alongside the standard ones.
+    Formatting happens on the QueueListener thread, so request handlers only
+    pay for enqueueing the record, not for encoding it.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "location": f"{record.filename}:{record.lineno}",
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str).decode()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Records are discarded when the queue is full, so a slow sink sheds
+    log volume instead of stalling request handling.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the record on the caller thread and
+        # merges the traceback into `msg`; the listener lives in the same
+        # process, so hand the record over untouched and let JSONFormatter
+        # render message, extras and exc_info there.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
 
 logger = logging.getLogger("frauds-detection")
 if len(logger.handlers) > 0:
     logger.handlers = []
 logger.setLevel(logging.INFO)
-fomatter = logging.Formatter(
-    "[%(asctime)s][%(levelname)s|%(filename)s:%(lineno)s] > %(message)s"
-)
+fomatter = JSONFormatter()
 streamHandler = logging.StreamHandler()
 streamHandler.setFormatter(fomatter)
-logger.addHandler(streamHandler)
+
+# Handlers run on the listener thread; call log_listener.start()/stop() around
+# the application lifetime.
+log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+log_listener = QueueListener(log_queue, streamHandler, respect_handler_level=True)
+logger.addHandler(DroppingQueueHandler(log_queue))
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from .secret import SecretSettings
 from .settings import BasicSettings, load_basic_settings
 
@@ -45,6 +47,16 @@ class Settings:
         """
         return self.basic.MODEL_WEIGHT_PATH
 
+    @property
+    def MODEL_ONNX_PATH(self) -> Optional[str]:
+        """
+        Path to the ONNX export of the model, if ONNX Runtime should serve it.
+
+        Returns:
+            Optional[str]: File system path of the .onnx model, or None to use joblib.
+        """
+        return self.basic.MODEL_ONNX_PATH
+
     @property
     def FEATURE_COLS(self) -> list[str]:
         """
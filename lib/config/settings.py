@@ -1,7 +1,10 @@
-from typing import List
+import os
+from typing import List, Optional
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from lib.common.constant import DB_MAX_OVERFLOW, DB_POOL_SIZE
 
 
 class BasicSettings(BaseModel):
@@ -14,6 +17,18 @@ class BasicSettings(BaseModel):
         DB_PORT (int): Port number on which the database listens.
         MODEL_WEIGHT_PATH (str): File path to the model weights.
         FEATURE_COLS (List[str]): Columns used for model features.
+        BATCH_SIZE (int): Maximum number of transactions scored per model call.
+        BATCH_TIMEOUT_MS (float): How long to wait for a prediction batch to fill.
+        UVICORN_WORKERS (int): Number of server processes, each loading its own model.
+        INFERENCE_WORKERS (int): Threads serving blocking inference and DB calls, per process.
+            Defaults to the CPU cores divided between the server processes.
+        DB_POOL_SIZE (int): Database connections kept open, per process.
+            Defaults to 20 divided between the server processes.
+        DB_MAX_OVERFLOW (int): Extra database connections allowed under load, per process.
+            Defaults to 40 divided between the server processes.
+        MODEL_ONNX_PATH (Optional[str]): ONNX export of the model; served with ONNX Runtime when set.
+        ONNX_INTRA_OP_THREADS (int): ONNX Runtime threads per operator, per process.
+            Defaults to the CPU cores divided between the server processes.
     """
 
     DB_NAME: str
@@ -21,6 +36,47 @@ class BasicSettings(BaseModel):
     DB_PORT: int
     MODEL_WEIGHT_PATH: str
     FEATURE_COLS: List[str] = Field(..., description="Columns used for model features")
+    BATCH_SIZE: int = Field(32, description="Maximum transactions per model call")
+    BATCH_TIMEOUT_MS: float = Field(
+        2.0, description="Batch fill window in milliseconds"
+    )
+    UVICORN_WORKERS: int = Field(1, ge=1, description="Number of server processes")
+    INFERENCE_WORKERS: Optional[int] = Field(
+        None, description="Per-process thread pool size for inference and DB calls"
+    )
+    DB_POOL_SIZE: Optional[int] = Field(
+        None, description="Per-process database connection pool size"
+    )
+    DB_MAX_OVERFLOW: Optional[int] = Field(
+        None, description="Per-process connections allowed beyond the pool size"
+    )
+    MODEL_ONNX_PATH: Optional[str] = Field(
+        None, description="ONNX model served with ONNX Runtime instead of joblib"
+    )
+    ONNX_INTRA_OP_THREADS: Optional[int] = Field(
+        None, description="Per-process ONNX Runtime intra-op threads"
+    )
+
+    @model_validator(mode="after")
+    def split_across_workers(self) -> "BasicSettings":
+        """
+        Fill unset per-process limits with a share of the machine-wide budget.
+
+        Every server process builds its own thread pools and connection pool,
+        so the CPU cores and the database connections are divided by
+        `UVICORN_WORKERS` instead of being multiplied by it.
+        """
+        workers = self.UVICORN_WORKERS
+        cores = max(1, (os.cpu_count() or 1) // workers)
+        if self.INFERENCE_WORKERS is None:
+            self.INFERENCE_WORKERS = cores
+        if self.ONNX_INTRA_OP_THREADS is None:
+            self.ONNX_INTRA_OP_THREADS = cores
+        if self.DB_POOL_SIZE is None:
+            self.DB_POOL_SIZE = max(1, DB_POOL_SIZE // workers)
+        if self.DB_MAX_OVERFLOW is None:
+            self.DB_MAX_OVERFLOW = DB_MAX_OVERFLOW // workers
+        return self
 
 
 def load_basic_settings(path: str = "config.yaml") -> BasicSettings:
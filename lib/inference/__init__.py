@@ -0,0 +1 @@
+from .onnx_model import OnnxModel, export_onnx
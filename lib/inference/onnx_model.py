@@ -0,0 +1,144 @@
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+# ONNX tensor element types mapped to the numpy dtype fed to the session
+_INPUT_DTYPES: Dict[str, Any] = {
+    "tensor(float)": np.float32,
+    "tensor(double)": np.float64,
+    "tensor(int64)": np.int64,
+    "tensor(string)": object,
+}
+
+
+class OnnxModel:
+    """
+    ONNX Runtime backed replacement for the joblib-loaded sklearn pipeline.
+
+    Exposes the same `.predict(DataFrame)` interface as the pipeline, so
+    FraudsService can use either interchangeably. The ONNX graph is expected
+    to have one `[None, 1]` input per feature column, named after the column,
+    as produced by `export_onnx`.
+
+    Args:
+        session (onnxruntime.InferenceSession): Loaded inference session.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._inputs = [
+            (node.name, _INPUT_DTYPES[node.type]) for node in session.get_inputs()
+        ]
+        # skl2onnx classifiers emit the label first, then probabilities
+        self._label = session.get_outputs()[0].name
+
+    @classmethod
+    def from_path(cls, path: str, intra_op_threads: int = 0) -> "OnnxModel":
+        """
+        Load an ONNX model with full graph optimizations on the CPU provider.
+
+        Args:
+            path (str): File system path of the .onnx model.
+            intra_op_threads (int): Threads used inside a single operator.
+                0 lets ONNX Runtime pick one per physical core.
+
+        Returns:
+            OnnxModel: The wrapped inference session.
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError as exc:
+            raise ImportError(
+                "MODEL_ONNX_PATH is set but onnxruntime is not installed; "
+                "install the 'onnx' extra"
+            ) from exc
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        session = ort.InferenceSession(
+            path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        return cls(session)
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Predict fraud labels for every row of `df`.
+
+        Args:
+            df (pd.DataFrame): Feature frame with one column per model input.
+
+        Returns:
+            np.ndarray: Predicted label for each row.
+        """
+        feeds = {
+            name: df[name].to_numpy(dtype=dtype).reshape(-1, 1)
+            for name, dtype in self._inputs
+        }
+        return self._session.run([self._label], feeds)[0]
+
+
+def export_onnx(
+    model, sample: pd.DataFrame, path: str, parity_rows: int = 1000
+) -> None:
+    """
+    Convert a trained sklearn pipeline to ONNX for use with `OnnxModel`.
+
+    Meant to be run offline after training, e.g. from the training notebook:
+
+        export_onnx(best_model, X_train, "../weight/fraud_detection_rf_model.onnx")
+
+    Numeric columns become float inputs and all others string inputs,
+    each named after its column so the pipeline's ColumnTransformer can
+    select them.
+
+    Before writing, the converted graph is run through `OnnxModel` on the
+    first `parity_rows` sample rows, as the same object-dtype frame the
+    service builds, and its labels are compared against `model.predict`.
+
+    Args:
+        model: Fitted sklearn pipeline.
+        sample (pd.DataFrame): Frame with the training feature columns and dtypes.
+        path (str): Destination .onnx file.
+        parity_rows (int): Number of sample rows checked against the pipeline.
+
+    Raises:
+        ValueError: If any checked row is labelled differently by the ONNX graph.
+    """
+    import onnxruntime as ort
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType, StringTensorType
+
+    initial_types = [
+        (
+            col,
+            (
+                FloatTensorType([None, 1])
+                if is_numeric_dtype(sample[col])
+                else StringTensorType([None, 1])
+            ),
+        )
+        for col in sample.columns
+    ]
+    onx = convert_sklearn(
+        model,
+        initial_types=initial_types,
+        options={"zipmap": False},
+    )
+    serialized = onx.SerializeToString()
+
+    rows = sample.head(parity_rows).astype(object)
+    session = ort.InferenceSession(serialized, providers=["CPUExecutionProvider"])
+    expected = np.asarray(model.predict(rows)).ravel()
+    actual = np.asarray(OnnxModel(session).predict(rows)).ravel()
+    mismatches = int((actual != expected).sum())
+    if mismatches:
+        raise ValueError(
+            f"ONNX export disagrees with the pipeline on {mismatches} of "
+            f"{len(rows)} sample rows; not writing {path}"
+        )
+
+    with open(path, "wb") as f:
+        f.write(serialized)
@@ -4,4 +4,4 @@ from .api_model import (
     TransactionAPIResponse,
     TransactionsAPIResponse,
 )
-from .transaction_record_model import TransactionRecord
+from .transaction_record_model import TransactionRecord, TransactionRecordVersion
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import ClassVar, Optional
 
-from sqlmodel import TIMESTAMP, Column, Field, SQLModel, text
+from sqlmodel import TIMESTAMP, Column, Field, Index, SQLModel, text
 
 
 class TransactionBase(SQLModel):
@@ -51,6 +51,9 @@ class TransactionRecord(TransactionBase, table=True):
     """
 
     __tablename__ = "predicted_transactions"
+    __table_args__ = (
+        Index("ix_predicted_transactions_predicted_at_id", "predicted_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     is_fraud: bool = Field(
@@ -67,6 +70,24 @@ class TransactionRecord(TransactionBase, table=True):
     )
 
 
+class TransactionRecordVersion(SQLModel, table=True):
+    """
+    Single-row counter bumped in the same transaction as every insert into
+    predicted_transactions, so readers can tell when the table has changed.
+
+    Args:
+        id (int): Primary key; the only row uses `ROW_ID`.
+        version (int): Number of committed prediction write batches.
+    """
+
+    __tablename__ = "predicted_transactions_version"
+
+    ROW_ID: ClassVar[int] = 1
+
+    id: int = Field(default=ROW_ID, primary_key=True)
+    version: int = Field(default=0, nullable=False)
+
+
 class Transaction(TransactionBase):
     """
     Pydantic schema for incoming/outgoing payloads.
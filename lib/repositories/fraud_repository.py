@@ -1,52 +1,184 @@
-from sqlmodel import Session, SQLModel, create_engine, select
+from datetime import datetime
+from typing import Iterator, Optional, Sequence
 
-from lib.models import TransactionRecord
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session, SQLModel, create_engine, insert, select, update
+
+from lib.models import TransactionRecord, TransactionRecordVersion
 
 
 class FraudRepository:
     """
     Handles DB interactions for transaction predictions,
-    using SQLModel + a single Engine/Session.
+    using SQLModel + a single pooled Engine and session factory.
     """
 
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, pool_size: int = 20, max_overflow: int = 40):
         """
-        Initializes the repository with a database engine.
+        Initializes the repository with a pooled database engine.
 
         Args:
             database_url (str): The database connection URL.
+            pool_size (int): Number of connections kept open in the pool.
+            max_overflow (int): Extra connections allowed beyond `pool_size` under load.
         """
         self._engine = create_engine(
             database_url,
             echo=False,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
+        )
+        self._session_factory = sessionmaker(
+            bind=self._engine,
+            class_=Session,
+            expire_on_commit=False,
         )
         SQLModel.metadata.create_all(self._engine)
+        self._ensure_version_row()
 
-    def add(self, record: TransactionRecord) -> TransactionRecord:
+    def add_many(self, records: list[TransactionRecord]) -> list[TransactionRecord]:
         """
-        Inserts a new TransactionRecord into the DB, commits,
-        refreshes it with generated fields (id, predicted_at),
-        and returns it.
+        Inserts several TransactionRecords in a single transaction.
+
+        Rows go through one Core executemany INSERT built from plain value
+        dicts, so the records are never attached to the session and a failed
+        call can simply be retried with the same objects. The table version
+        is bumped in the same transaction, so it changes exactly when the new
+        rows become visible to readers.
+
+        Server-generated `id` and `predicted_at` values are not loaded back
+        onto the records.
 
         Args:
-            record (TransactionRecord): The transaction record to insert.
+            records (List[TransactionRecord]): The transaction records to insert.
 
         Returns:
-            TransactionRecord: The inserted record with refreshed fields (id, predicted_at).
+            List[TransactionRecord]: The inserted records.
         """
-        with Session(self._engine) as session:
-            session.add(record)
+        rows = [record.model_dump(exclude={"id", "predicted_at"}) for record in records]
+        bump = (
+            update(TransactionRecordVersion)
+            .where(TransactionRecordVersion.id == TransactionRecordVersion.ROW_ID)
+            .values(version=TransactionRecordVersion.version + 1)
+        )
+        with self._session_factory() as session:
+            session.exec(insert(TransactionRecord), params=rows)
+            session.exec(bump)
             session.commit()
-            session.refresh(record)
-            return record
+            return records
+
+    def version(self) -> int:
+        """
+        Returns the current version of predicted_transactions.
+
+        Incremented by every committed `add_many`, whichever process or
+        thread wrote it and in whatever order their ids were allocated, so
+        it is safe to use as a cache validator (a single primary key lookup).
+
+        Returns:
+            int: The number of committed write batches.
+        """
+        stmt = select(TransactionRecordVersion.version).where(
+            TransactionRecordVersion.id == TransactionRecordVersion.ROW_ID
+        )
+        with self._session_factory() as session:
+            return session.exec(stmt).one_or_none() or 0
+
+    def list_rows(
+        self,
+        columns: Sequence[str],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        since: Optional[datetime] = None,
+    ) -> list[tuple]:
+        """
+        Returns a page of raw column values from predicted_transactions, newest first.
+
+        Skips ORM object construction entirely, for read paths that only
+        need the values.
+
+        Args:
+            columns (Sequence[str]): TransactionRecord attribute names to select, in order.
+            limit (Optional[int]): Maximum number of rows to return. Defaults to all.
+            offset (int): Number of newest rows to skip. Defaults to 0.
+            since (Optional[datetime]): Only include rows predicted at or after this time.
+
+        Returns:
+            List[tuple]: One tuple per row, with values in `columns` order.
+        """
+        entities = [getattr(TransactionRecord, col) for col in columns]
+        stmt = self._newest_first(since, *entities).offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with self._session_factory() as session:
+            return [tuple(row) for row in session.exec(stmt)]
+
+    def iter_row_chunks(
+        self,
+        columns: Sequence[str],
+        since: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[list[tuple]]:
+        """
+        Streams raw column values from predicted_transactions, newest first.
+
+        Rows are fetched `chunk_size` at a time (a server-side cursor on
+        Postgres) and yielded one chunk per round trip, so memory stays
+        bounded regardless of table size. The session stays open until the
+        iterator is exhausted or closed; callers that may stop early should
+        call `close()` on it.
+
+        Args:
+            columns (Sequence[str]): TransactionRecord attribute names to select, in order.
+            since (Optional[datetime]): Only include records predicted at or after this time.
+            chunk_size (int): Number of rows fetched per round trip.
+
+        Yields:
+            List[tuple]: Up to `chunk_size` rows, with values in `columns` order.
+        """
+        entities = [getattr(TransactionRecord, col) for col in columns]
+        stmt = self._newest_first(since, *entities).execution_options(
+            yield_per=chunk_size
+        )
+        with self._session_factory() as session:
+            for partition in session.exec(stmt).partitions():
+                yield [tuple(row) for row in partition]
+
+    def _ensure_version_row(self) -> None:
+        """
+        Creates the predicted_transactions version row if it does not exist yet.
+
+        Several workers may start at once; losing the insert race is fine.
+        """
+        with self._session_factory() as session:
+            if session.get(TransactionRecordVersion, TransactionRecordVersion.ROW_ID):
+                return
+            session.add(TransactionRecordVersion())
+            try:
+                session.commit()
+            except IntegrityError:
+                session.rollback()
 
-    def list_all(self) -> list[TransactionRecord]:
+    @staticmethod
+    def _newest_first(since: Optional[datetime] = None, *entities):
         """
-        Returns every record in predicted_transactions, newest first.
+        Builds the base newest-first query over predicted_transactions.
+
+        Rows written in one `add_many` transaction share `predicted_at`,
+        so `id` breaks ties to keep LIMIT/OFFSET pages stable.
+
+        Args:
+            since (Optional[datetime]): Only include records predicted at or after this time.
+            *entities: Columns to select instead of whole TransactionRecord objects.
 
         Returns:
-            List[TransactionRecord]: List of all transaction records ordered by prediction time descending.
+            SelectOfScalar[TransactionRecord]: The select statement.
         """
-        stmt = select(TransactionRecord).order_by(TransactionRecord.predicted_at.desc())
-        with Session(self._engine) as session:
-            return session.exec(stmt).all()
+        stmt = select(*(entities or (TransactionRecord,))).order_by(
+            TransactionRecord.predicted_at.desc(), TransactionRecord.id.desc()
+        )
+        if since is not None:
+            stmt = stmt.where(TransactionRecord.predicted_at >= since)
+        return stmt
@@ -1,15 +1,24 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
 
 import joblib
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import URL, Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from api import routes
 from api.controllers import FraudsController
+from api.dependencies import set_frauds_controller
 from api.services import FraudsService
-from lib.common import logger
+from lib.common import log_listener, logger
+from lib.common.constant import REQUEST_LOG_SAMPLE_RATE
 from lib.config import settings
+from lib.inference import OnnxModel
 from lib.repositories import FraudRepository
 
 API_PREFIX = "/api"
@@ -17,40 +26,88 @@ API_PREFIX = "/api"
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    log_listener.start()
     try:
-        logger.info("Loading model weights", extra={"path": settings.MODEL_WEIGHT_PATH})
-        data = joblib.load(settings.MODEL_WEIGHT_PATH)
-        model = data["model"]
+        if settings.MODEL_ONNX_PATH:
+            logger.info("Loading ONNX model", extra={"path": settings.MODEL_ONNX_PATH})
+            model = OnnxModel.from_path(
+                settings.MODEL_ONNX_PATH,
+                intra_op_threads=settings.basic.ONNX_INTRA_OP_THREADS,
+            )
+        else:
+            logger.info(
+                "Loading model weights", extra={"path": settings.MODEL_WEIGHT_PATH}
+            )
+            # Memory-map the weight arrays so worker processes share them via the page cache
+            data = joblib.load(settings.MODEL_WEIGHT_PATH, mmap_mode="r")
+            model = data["model"]
+
+        inference_pool = ThreadPoolExecutor(
+            max_workers=settings.basic.INFERENCE_WORKERS,
+            thread_name_prefix="inference",
+        )
 
-        repo = FraudRepository(database_url=settings.DATABASE_URL)
+        repo = FraudRepository(
+            database_url=settings.DATABASE_URL,
+            pool_size=settings.basic.DB_POOL_SIZE,
+            max_overflow=settings.basic.DB_MAX_OVERFLOW,
+        )
         service = FraudsService(
             repository=repo,
             model=model,
             feature_cols=settings.FEATURE_COLS,
+            max_batch_size=settings.basic.BATCH_SIZE,
+            batch_timeout_ms=settings.basic.BATCH_TIMEOUT_MS,
+            executor=inference_pool,
         )
+        try:
+            service.warmup()
+            logger.info("Model warm-up complete")
+        except Exception:
+            logger.warning("Model warm-up failed", exc_info=True)
+
+        batch_worker = asyncio.create_task(service.run_batch_worker())
+        write_worker = asyncio.create_task(service.run_write_worker())
         controller = FraudsController(service)
-        app.state.fraud_controller = controller
+        set_frauds_controller(controller)
+        routes.build_openapi_schema(app)
 
         logger.info(
             "Service and Controller initialized",
             extra={
                 "features": settings.FEATURE_COLS,
-                "database_url": settings.DATABASE_URL,
+                "database": (
+                    f"{settings.basic.DB_HOST}:{settings.basic.DB_PORT}"
+                    f"/{settings.basic.DB_NAME}"
+                ),
             },
         )
         yield
 
+        batch_worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await batch_worker
+        await service.close_write_queue()
+        await write_worker
+        inference_pool.shutdown(wait=True)
+        set_frauds_controller(None)
+
     except Exception:
         logger.exception("Error during startup")
         raise
     finally:
         logger.info("Application shutdown complete")
+        log_listener.stop()
 
 
 app = FastAPI(
     title="Fraud Detection System Service API",
     version="1.0.0",
     lifespan=lifespan,
+    # /docs, /redoc and /openapi.json are served by routes.swagger_router
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
     swagger_ui_parameters={"defaultModelsExpandDepth": -1},
     contact={"name": "Kiattiphum Suwanarsa"},
     license_info={"name": "MIT"},
@@ -65,29 +122,66 @@ app.add_middleware(
 )
 
 
-async def log_requests(request: Request, call_next):
-    req_id = request.headers.get("X-Request-ID", "")
-    logger.info(
-        "→ Request start",
-        extra={
-            "method": request.method,
-            "url": str(request.url),
-            "client": request.client.host,
-            "request_id": req_id,
-        },
-    )
-    response = await call_next(request)
-    logger.info(
-        "← Request end",
-        extra={
-            "status_code": response.status_code,
-            "method": request.method,
-            "url": str(request.url),
-            "request_id": req_id,
-        },
-    )
-    return response
+class RequestLogMiddleware:
+    """
+    Pure ASGI middleware logging the start and end of sampled requests.
+
+    Requests tagged with an X-Request-ID are always traced; untagged ones
+    are sampled at `REQUEST_LOG_SAMPLE_RATE` unless debug logging is on.
+    Untraced requests are passed straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        req_id = Headers(scope=scope).get("x-request-id", "")
+        traced = (
+            bool(req_id)
+            or logger.isEnabledFor(logging.DEBUG)
+            or random.random() < REQUEST_LOG_SAMPLE_RATE
+        )
+        if not traced:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        url_str = str(URL(scope=scope))
+        client = scope.get("client")
+        logger.info(
+            "→ Request start",
+            extra={
+                "method": method,
+                "url": url_str,
+                "client": client[0] if client else "-",
+                "request_id": req_id,
+            },
+        )
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+        logger.info(
+            "← Request end",
+            extra={
+                "status_code": status_code,
+                "method": method,
+                "url": url_str,
+                "request_id": req_id,
+            },
+        )
+
 
+app.add_middleware(RequestLogMiddleware)
 
 app.include_router(routes.swagger_router)
 app.include_router(routes.frauds_router, prefix=API_PREFIX)
@@ -98,6 +192,9 @@ if __name__ == "__main__":
         "server:app",
         host="0.0.0.0",
         port=8080,
+        loop="auto",
+        http="httptools",
+        workers=settings.basic.UVICORN_WORKERS,
         log_level="info",
         access_log=False,
     )